@@ -1,42 +1,31 @@
+import asyncio
+import logging
 from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import database, security
 from app.models.user import User
 from app.models.document import Document
-from app.schemas.document import DocumentCreate, DocumentResponse
-from app.services.embedding import EmbeddingService
+from app.schemas.document import DocumentCreate, DocumentResponse, DocumentIngestResponse, IngestStatus
+from app.services.semantic_cache import SemanticCache
 from app.services.vector_store import VectorStore
+from app.workers.celery_app import embed_and_index, enqueue_ingest
 
 router = APIRouter()
+logger = logging.getLogger("recall.ingest")
 
-def simple_chunker(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-    """
-    Splits text into chunks of roughly 'chunk_size' characters.
-    Includes 'overlap' characters from the previous chunk to maintain context.
-    """
-    if not text:
-        return []
-    
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        chunks.append(chunk)
-        # Move forward, but step back by overlap amount
-        start += chunk_size - overlap
-    return chunks
-
-@router.post("/", response_model=DocumentResponse)
+@router.post("/", response_model=DocumentIngestResponse, status_code=status.HTTP_202_ACCEPTED)
 async def ingest_document(
     doc_in: DocumentCreate,
     current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     """
-    Ingest a document: Store metadata in SQL, Embed content, Store vectors in Chroma.
+    Ingest a document: Store metadata in SQL, then queue embedding and
+    vector storage on a Celery worker. Poll /ingest/status/{task_id} for progress.
     """
     # 1. Save Metadata & Raw Content to SQL
     doc_title = doc_in.title
@@ -52,55 +41,73 @@ async def ingest_document(
         user_id=current_user.id
     )
     db.add(db_doc)
-    db.commit()
-    db.refresh(db_doc)
-    
-    # 2. Chunk Text
-    chunks = simple_chunker(doc_in.content)
-    
-    # 3. Generate Embeddings (CPU intensive, in prod offload to Celery)
-    embeddings = EmbeddingService.embed_documents(chunks)
+    await db.commit()
     
+    # 2. Queue Chunk, Embed & Store on the worker, only once the row is committed.
+    # The broker publish is blocking I/O, so it goes to a thread.
+    try:
+        task = await asyncio.to_thread(enqueue_ingest, db_doc.id, current_user.id, doc_in.content)
+    except Exception:
+        # Without a task the document could never become searchable; don't keep it
+        logger.exception("Failed to queue document %s for indexing", db_doc.id)
+        await db.delete(db_doc)
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue the document for indexing. Please try again."
+        )
     
-    # 4. Store in Vector DB with Isolation
-    VectorStore.add_vectors(
-        user_id=current_user.id,
-        doc_id=db_doc.id,
-        texts=chunks,
-        embeddings=embeddings
-    )
-    
-    return db_doc
+    return DocumentIngestResponse.model_validate(db_doc).model_copy(update={"task_id": task.id})
 
 @router.get("/", response_model=List[DocumentResponse])
-def get_documents(
+async def get_documents(
     current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     """
     Get all documents for the current user.
     """
-    return db.query(Document).filter(Document.user_id == current_user.id).order_by(Document.created_at.desc()).all()
+    result = await db.execute(
+        select(Document).where(Document.user_id == current_user.id).order_by(Document.created_at.desc())
+    )
+    return result.scalars().all()
+
+@router.get("/status/{task_id}", response_model=IngestStatus)
+def get_ingest_status(
+    task_id: str,
+    current_user: User = Depends(security.get_current_user)
+):
+    """
+    Get the state of a background ingestion task owned by the current user.
+    """
+    if not task_id.startswith(f"{current_user.id}-"):
+        raise HTTPException(status_code=404, detail="Task not found")
+    result = embed_and_index.AsyncResult(task_id)
+    return IngestStatus(
+        task_id=task_id,
+        status=result.status,
+        chunks_indexed=result.result if result.successful() else None
+    )
 
 @router.get("/stats")
-def get_stats(
+async def get_stats(
     current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     """
     Get usage statistics for the user.
     """
-    docs = db.query(Document).filter(Document.user_id == current_user.id).all()
-    
-    total_memories = len(docs)
-    last_upload = None
-    if docs:
-        # Sort by creation time to find the latest
-        last_upload = max(doc.created_at for doc in docs)
-        
-    # Calculate storage size (approximate characters)
-    # in a real app, you might track this in a separate column or table
-    storage_bytes = sum(len(doc.content) for doc in docs)
+    # Aggregate in the database instead of loading every document.
+    # Storage size is approximate (characters); in a real app, you might
+    # track this in a separate column or table
+    result = await db.execute(
+        select(
+            func.count(Document.id),
+            func.max(Document.created_at),
+            func.coalesce(func.sum(func.length(Document.content)), 0)
+        ).where(Document.user_id == current_user.id)
+    )
+    total_memories, last_upload, storage_bytes = result.one()
     
     return {
         "stats": {
@@ -111,40 +118,48 @@ def get_stats(
     }
 
 @router.delete("/{doc_id}")
-def delete_document(
+async def delete_document(
     doc_id: int,
     current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     """
     Delete a document and its vectors.
     """
-    db_doc = db.query(Document).filter(Document.id == doc_id, Document.user_id == current_user.id).first()
+    result = await db.execute(
+        select(Document).where(Document.id == doc_id, Document.user_id == current_user.id)
+    )
+    db_doc = result.scalar_one_or_none()
     if not db_doc:
         raise HTTPException(status_code=404, detail="Document not found")
         
-    # Delete vectors first (or after, doesn't matter much)
-    # Note: VectorStore.delete_document implementation needs to be checked
-    VectorStore.delete_document(user_id=current_user.id, doc_id=doc_id)
+    # Delete the SQL row first: a running ingestion task re-checks it after
+    # writing vectors, so either it or we remove whatever it indexed
+    await db.delete(db_doc)
+    await db.commit()
     
-    db.delete(db_doc)
-    db.commit()
+    await run_in_threadpool(VectorStore.delete_document, user_id=current_user.id, doc_id=doc_id)
+    # Cached answers may quote the deleted document
+    await SemanticCache.invalidate(current_user.id)
     return {"status": "success"}
 
 @router.delete("/")
-def delete_all_documents(
+async def delete_all_documents(
     current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     """
     Delete ALL documents and vectors for the current user.
     """
-    # 1. Delete all vectors for this user
-    VectorStore.delete_user_vectors(user_id=current_user.id)
-    
-    # 2. Delete all documents from SQL
-    db.query(Document).filter(Document.user_id == current_user.id).delete()
-    db.commit()
+    # 1. Delete all documents from SQL (first, so in-flight ingestion tasks clean up after themselves)
+    await db.execute(delete(Document).where(Document.user_id == current_user.id))
+    await db.commit()
+
+    # 2. Delete all vectors for this user
+    await run_in_threadpool(VectorStore.delete_user_vectors, user_id=current_user.id)
+
+    # 3. Drop cached answers built from the deleted documents
+    await SemanticCache.invalidate(current_user.id)
     
     return {"status": "success", "message": "All data deleted"}
 
@@ -1,37 +1,44 @@
-from typing import List
+import logging
+import orjson
+from typing import List, Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from groq import AsyncGroq
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import database, security
 from app.core.config import settings
 from app.models.user import User
+from app.models.document import Document
 from app.schemas.document import SearchQuery, SearchResult, AugmentedQueryResponse
 from app.services.embedding import EmbeddingService
+from app.services.semantic_cache import SemanticCache
 from app.services.vector_store import VectorStore
 
 router = APIRouter()
+logger = logging.getLogger("recall.query")
 
-@router.post("/", response_model=AugmentedQueryResponse)
-async def search_memory(
-    query: SearchQuery,
-    current_user: User = Depends(security.get_current_user),
-):
-    """
-    Semantic search over the user's private memory.
-    Strictly isolated to 'current_user' data.
-    """
-    # 1. Embed Query
-    print(f"QUERY RECEIVED: {query.query}")
-    query_vector = EmbeddingService.embed_query(query.query)
-    
-    # 2. Search Vector DB (Restricted to user_id)
-    results = VectorStore.search(
-        user_id=current_user.id,
+# Shared client so connections to Groq are kept alive across requests
+_groq_client = AsyncGroq(api_key=settings.GROQ_API_KEY) if settings.GROQ_API_KEY else None
+
+SYSTEM_PROMPT = """You are RecallAI, a helpful memory assistant. 
+Answer the user's question based ONLY on the provided Context from their memories. 
+If the answer is not in the context, strictly say "I don't recall that information based on your stored memories." and do not hallucinate.
+Keep answers concise and friendly."""
+
+async def _retrieve(query: SearchQuery, query_vector: List[float], user_id: int, db: AsyncSession) -> List[SearchResult]:
+    """Search the user's vectors and attach each hit's snippet from SQL."""
+    # Search Vector DB (Restricted to user_id)
+    # Chroma's HNSW search is blocking; keep it off the event loop
+    results = await run_in_threadpool(
+        VectorStore.search,
+        user_id=user_id,
         query_vector=query_vector,
         k=query.k
     )
     
-    # 3. Format Response
     # Chroma returns lists of lists (batch format). We sent 1 query, so take index 0.
     formatted_results = []
     
@@ -39,66 +46,174 @@ async def search_memory(
     if results['ids'] and len(results['ids'][0]) > 0:
         ids = results['ids'][0]
         distances = results['distances'][0]
-        documents = results['documents'][0]
         metadatas = results['metadatas'][0]
+        documents = results['documents'][0]
+
+        # Chunk text is not duplicated in Chroma; slice snippets from the SQL content
+        doc_ids = {m['doc_id'] for m in metadatas}
+        rows = await db.execute(
+            select(Document.id, Document.content)
+            .where(Document.user_id == user_id, Document.id.in_(doc_ids))
+        )
+        contents = dict(rows.all())
 
         for i in range(len(ids)):
+            content = contents.get(metadatas[i]['doc_id'])
+            # Skip vectors whose document was deleted from SQL
+            if content is None:
+                continue
+            if 'start' in metadatas[i]:
+                snippet = content[metadatas[i]['start']:metadatas[i]['end']]
+            else:
+                # Older vectors kept their own chunk text in Chroma
+                snippet = documents[i]
             formatted_results.append(SearchResult(
                 document_id=metadatas[i]['doc_id'],
                 score=distances[i], 
-                content_snippet=documents[i],
+                content_snippet=snippet,
                 metadata=metadatas[i]
             ))
-            
-    # 4. Generate Answer with Groq
+    return formatted_results
+
+def _answer_without_llm(sources: List[SearchResult]) -> Optional[AugmentedQueryResponse]:
+    """Response for when the LLM can't or needn't be called; None if it should be."""
     # Check if API key is set
-    if not settings.GROQ_API_KEY:
+    if _groq_client is None:
          return AugmentedQueryResponse(
              answer="Groq API Key not set. Returning search results only.",
-             sources=formatted_results
+             sources=sources
          )
-
-    # Prepare Context
-    if not formatted_results:
+    if not sources:
         return AugmentedQueryResponse(
             answer="I couldn't find any relevant memories matching your query.",
             sources=[]
         )
-        
-    context_str = "\n\n".join([f"Memory {i+1}:\n{res.content_snippet}" for i, res in enumerate(formatted_results)])
-    
-    system_prompt = """You are RecallAI, a helpful memory assistant. 
-Answer the user's question based ONLY on the provided Context from their memories. 
-If the answer is not in the context, strictly say "I don't recall that information based on your stored memories." and do not hallucinate.
-Keep answers concise and friendly."""
+    return None
+
+def _build_messages(question: str, sources: List[SearchResult]) -> List[dict]:
+    context_str = "\n\n".join([f"Memory {i+1}:\n{res.content_snippet}" for i, res in enumerate(sources)])
     
     user_prompt = f"""Context:
 {context_str}
 
-User Question: {query.query}
+User Question: {question}
 """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Event; data is JSON-encoded so newlines can't break framing."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+@router.post("/", response_model=AugmentedQueryResponse)
+async def search_memory(
+    query: SearchQuery,
+    current_user: User = Depends(security.get_current_user),
+    db: AsyncSession = Depends(database.get_db)
+):
+    """
+    Semantic search over the user's private memory.
+    Strictly isolated to 'current_user' data.
+    """
+    # 1. Embed Query
+    logger.debug("query received: %s", query.query)
+    # Model inference is CPU-bound; keep it off the event loop
+    query_vector = await run_in_threadpool(EmbeddingService.embed_query, query.query)
+
+    # Near-duplicate questions are answered from the cache, skipping search and the LLM
+    cached = await SemanticCache.check(user_id=current_user.id, k=query.k, vec=query_vector, threshold=0.95)
+    if cached is not None:
+        return cached
+    
+    # 2. Search Vector DB & Format Results
+    formatted_results = await _retrieve(query, query_vector, current_user.id, db)
+            
+    # 3. Generate Answer with Groq
+    response = _answer_without_llm(formatted_results)
+    if response is not None:
+        return response
 
     try:
-        from groq import Groq
-        client = Groq(api_key=settings.GROQ_API_KEY)
-        
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+        chat_completion = await _groq_client.chat.completions.create(
+            messages=_build_messages(query.query, formatted_results),
             model="llama-3.3-70b-versatile",
             temperature=0.5,
             max_tokens=500
         )
         answer = chat_completion.choices[0].message.content
     except Exception as e:
-        print(f"Groq API Error: {e}")
-        import traceback
-        traceback.print_exc()
-        answer = f"I found some memories, but I couldn't generate a summary right now. Error: {str(e)}"
+        logger.exception("Groq API error")
+        # Failed generations are returned as-is and never cached
+        return AugmentedQueryResponse(
+            answer=f"I found some memories, but I couldn't generate a summary right now. Error: {str(e)}",
+            sources=formatted_results
+        )
 
-    return AugmentedQueryResponse(
+    response = AugmentedQueryResponse(
         answer=answer,
         sources=formatted_results
     )
+    await SemanticCache.store(current_user.id, query.k, query_vector, response, ttl=300)
+    return response
+
+@router.post("/stream")
+async def stream_memory(
+    query: SearchQuery,
+    current_user: User = Depends(security.get_current_user),
+    db: AsyncSession = Depends(database.get_db)
+):
+    """
+    Same as search_memory, but streams the answer as Server-Sent Events:
+    'token' events carry answer text as it is generated, followed by one
+    'sources' event. A failed generation emits an 'error' event before 'sources'.
+    """
+    logger.debug("streaming query received: %s", query.query)
+    # Model inference is CPU-bound; keep it off the event loop
+    query_vector = await run_in_threadpool(EmbeddingService.embed_query, query.query)
+
+    # Retrieval runs before streaming starts, while the DB session is open
+    formatted_results: List[SearchResult] = []
+    response = await SemanticCache.check(user_id=current_user.id, k=query.k, vec=query_vector, threshold=0.95)
+    if response is None:
+        formatted_results = await _retrieve(query, query_vector, current_user.id, db)
+        response = _answer_without_llm(formatted_results)
+
+    async def event_stream():
+        if response is not None:
+            yield _sse("token", {"content": response.answer})
+            yield _sse("sources", [s.model_dump() for s in response.sources])
+            return
+
+        sources = [s.model_dump() for s in formatted_results]
+        answer_parts = []
+        try:
+            stream = await _groq_client.chat.completions.create(
+                messages=_build_messages(query.query, formatted_results),
+                model="llama-3.3-70b-versatile",
+                temperature=0.5,
+                max_tokens=500,
+                stream=True
+            )
+            async for chunk in stream:
+                content = chunk.choices[0].delta.content
+                if content:
+                    answer_parts.append(content)
+                    yield _sse("token", {"content": content})
+        except Exception as e:
+            logger.exception("Groq API error")
+            yield _sse("error", {"detail": f"I found some memories, but I couldn't generate a summary right now. Error: {str(e)}"})
+            yield _sse("sources", sources)
+            return
+
+        yield _sse("sources", sources)
+        await SemanticCache.store(
+            current_user.id,
+            query.k,
+            query_vector,
+            AugmentedQueryResponse(answer="".join(answer_parts), sources=formatted_results),
+            ttl=300
+        )
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -13,6 +14,11 @@ class Settings(BaseSettings):
     # DATABASE
     # Using SQLite for generic file-based approach as requested by "free constraints" and easy deployment
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./sql_app.db"
+    # Connection pool sizing (per worker process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600 # seconds
     
     # VECTOR STORE
     # Path where ChromaDB will persist data locally
@@ -21,7 +27,27 @@ class Settings(BaseSettings):
     # EMBEDDING MODEL
     # MiniLM is efficient and free
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    # "minilm" (ONNX model, required to be exported) or "hash" (dev fallback).
+    # Must be the same for the API and the Celery workers.
+    EMBEDDING_BACKEND: Literal["minilm", "hash"] = "minilm"
+    # ONNX export of the model, produced with:
+    # optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 ./onnx_minilm
+    EMBEDDING_ONNX_DIR: str = os.path.join(os.getcwd(), "onnx_minilm")
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256
+    # ONNX Runtime threads per process; scale throughput with more workers, not threads
+    EMBEDDING_NUM_THREADS: int = 1
     
+    # SEMANTIC CACHE
+    # Redis Stack instance (RediSearch module required for vector lookups)
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Connect/read timeout (seconds); the cache must never hold up a query for long
+    REDIS_TIMEOUT: float = 0.5
+
+    # BACKGROUND WORKERS
+    # Celery broker/result backend used for ingestion (embedding + vector writes)
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/1")
+    CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/2")
+
     # LLM
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
 
@@ -1,21 +1,44 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+def _async_uri(uri: str) -> str:
+    """Map a sync database URI onto its async driver (aiosqlite / asyncpg)."""
+    if uri.startswith("sqlite://"):
+        return uri.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if uri.startswith("postgresql://"):
+        return uri.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return uri
+
 # For SQLite, we need this connect_args check_same_thread=False
 connect_args = {"check_same_thread": False} if "sqlite" in settings.SQLALCHEMY_DATABASE_URI else {}
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args
+# Explicit QueuePool so SQLite and PostgreSQL get the same sizing; pre_ping drops
+# dead connections before use and recycle avoids server-side idle timeouts.
+engine = create_async_engine(
+    _async_uri(settings.SQLALCHEMY_DATABASE_URI),
+    connect_args=connect_args,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True
+)
+# expire_on_commit=False: attributes stay loaded after commit, as lazy loads can't run in async code
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# Celery workers are synchronous; they use a plain engine on the same database
+sync_engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args, pool_pre_ping=True
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SyncSessionLocal = sessionmaker(bind=sync_engine, autoflush=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,14 +1,16 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.database import engine, Base
+from app.services.embedding import EmbeddingService
 
-# In a real production setup, we would use Alembic for migrations.
-# For this setup, we auto-create tables on startup.
-Base.metadata.create_all(bind=engine)
+logging.basicConfig(level=logging.INFO)
 
-app = FastAPI(title=settings.PROJECT_NAME)
+# orjson serializes responses (and datetimes) far faster than the stdlib json encoder
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse)
 
 # CORS - Allow all for development flexibility
 app.add_middleware(
@@ -21,8 +23,23 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+def _create_missing_indexes(conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 @app.on_event("startup")
 async def startup_event():
+    # In a real production setup, we would use Alembic for migrations.
+    # For this setup, we auto-create tables on startup.
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add indexes introduced since (no Alembic yet)
+        await conn.run_sync(_create_missing_indexes)
+
+    # Load the embedding model now: fails fast if it is expected but not exported
+    EmbeddingService.get_model()
+
     with open("routes.txt", "w") as f:
         for route in app.routes:
             f.write(f"{route.methods} {route.path}\n")
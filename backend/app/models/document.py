@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -13,3 +13,7 @@ class Document(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     owner = relationship("app.models.user.User")
+
+# Serves "WHERE user_id = ? ORDER BY created_at DESC" as an ordered index range scan.
+# The leading user_id column also covers the per-user count/delete queries.
+Index("ix_documents_user_created", Document.user_id, Document.created_at.desc())
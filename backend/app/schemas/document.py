@@ -14,6 +14,14 @@ class DocumentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DocumentIngestResponse(DocumentResponse):
+    task_id: Optional[str] = None
+
+class IngestStatus(BaseModel):
+    task_id: str
+    status: str
+    chunks_indexed: Optional[int] = None
+
 class SearchQuery(BaseModel):
     query: str
     k: int = 5
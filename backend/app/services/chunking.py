@@ -0,0 +1,65 @@
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.embedding import EmbeddingService
+
+def simple_chunker(text: str, chunk_size: int = 500, overlap: int = 50) -> List[Tuple[int, int]]:
+    """
+    Splits text into (start, end) ranges of roughly 'chunk_size' characters.
+    Includes 'overlap' characters from the previous chunk to maintain context.
+    """
+    if not text:
+        return []
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    # Overlap must leave a forward step, or the loop never ends
+    overlap = min(overlap, chunk_size - 1)
+    
+    ranges = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        ranges.append((start, end))
+        # Move forward, but step back by overlap amount
+        start += chunk_size - overlap
+    return ranges
+
+def token_chunker(text: str, tokenizer, chunk_tokens: Optional[int] = None, overlap_tokens: int = 32) -> List[Tuple[int, int]]:
+    """
+    Splits text on token boundaries into (start, end) character ranges of at most
+    'chunk_tokens' tokens, sized to fill the embedding model's window.
+    Consecutive chunks share 'overlap_tokens'.
+    """
+    if not text:
+        return []
+    if chunk_tokens is None:
+        # Leave room for the [CLS] and [SEP] tokens added at embedding time
+        chunk_tokens = settings.EMBEDDING_MAX_SEQ_LENGTH - 2
+    if chunk_tokens < 1:
+        raise ValueError("chunk_tokens must be at least 1 (check EMBEDDING_MAX_SEQ_LENGTH)")
+    # Overlap must leave a forward step, or range() below gets a step <= 0
+    overlap_tokens = min(overlap_tokens, chunk_tokens - 1)
+
+    offsets = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+    )["offset_mapping"]
+
+    ranges = []
+    for start in range(0, len(offsets), chunk_tokens - overlap_tokens):
+        window = offsets[start:start + chunk_tokens]
+        ranges.append((window[0][0], window[-1][1]))
+        if start + chunk_tokens >= len(offsets):
+            break
+    return ranges
+
+def chunk_ranges(text: str) -> List[Tuple[int, int]]:
+    """
+    Chunk with the embedding model's tokenizer when available,
+    otherwise fall back to character chunks for the hash embedder.
+    Returns (start, end) offsets into 'text'; slice only where strings are needed.
+    """
+    model = EmbeddingService.get_model()
+    if model is None:
+        return simple_chunker(text)
+    _, tokenizer = model
+    return token_chunker(text, tokenizer)
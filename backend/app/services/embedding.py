@@ -1,39 +1,121 @@
 import hashlib
+import os
 import numpy as np
+import onnxruntime as ort
 from typing import List
+from transformers import AutoTokenizer
+
+from app.core.config import settings
 
 class EmbeddingService:
     """
-    Simple hash-based embedding service as fallback.
-    Generates consistent 384-dimensional vectors from text.
+    Sentence embeddings from all-MiniLM-L6-v2 executed with ONNX Runtime.
+    With EMBEDDING_BACKEND="hash", consistent hash-based 384-dimensional vectors
+    are used instead (e.g. local dev without the export step). The backend is
+    chosen explicitly so API and worker processes never mix vector spaces.
     """
-    
+    _session = None
+    _tokenizer = None
+
+    BATCH_SIZE = 32
+
+    @classmethod
+    def get_model(cls):
+        """Load the ONNX session and tokenizer once; None when the hash backend is configured."""
+        if settings.EMBEDDING_BACKEND == "hash":
+            return None
+        if cls._session is None:
+            model_path = os.path.join(settings.EMBEDDING_ONNX_DIR, "model.onnx")
+            if not os.path.exists(model_path):
+                raise RuntimeError(
+                    f"Embedding model not found at {model_path}. Export it with "
+                    "'optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 ./onnx_minilm' "
+                    "or set EMBEDDING_BACKEND=hash."
+                )
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            # One thread per process: with several uvicorn/Celery workers, ORT's default
+            # pool (one thread per core) in each process oversubscribes the CPU.
+            sess_options.intra_op_num_threads = settings.EMBEDDING_NUM_THREADS
+            sess_options.inter_op_num_threads = 1
+            sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            cls._tokenizer = AutoTokenizer.from_pretrained(settings.EMBEDDING_ONNX_DIR)
+            cls._session = ort.InferenceSession(
+                model_path, sess_options, providers=["CPUExecutionProvider"]
+            )
+        return cls._session, cls._tokenizer
+
+    @staticmethod
+    def _encode(texts: List[str]) -> np.ndarray:
+        """Run MiniLM over a batch, returning mean-pooled, L2-normalized (N, 384) vectors"""
+        session, tokenizer = EmbeddingService.get_model()
+        # Pad only up to the longest text in the batch, not the model maximum
+        encoded = tokenizer(
+            texts,
+            padding="longest",
+            truncation=True,
+            max_length=settings.EMBEDDING_MAX_SEQ_LENGTH,
+            return_tensors="np",
+        )
+        input_names = {i.name for i in session.get_inputs()}
+        feed = {k: v.astype(np.int64) for k, v in encoded.items() if k in input_names}
+        token_embeddings = session.run(None, feed)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / mask.sum(axis=1).clip(min=1e-9)
+        pooled /= np.linalg.norm(pooled, axis=1, keepdims=True).clip(min=1e-12)
+        return pooled
+
+    @staticmethod
+    def _hash_bytes(text: str) -> bytes:
+        """384 hash bytes for a text from one SHAKE256 expansion"""
+        # A single pass over the text, instead of 12 seeded SHA-256 passes
+        return hashlib.shake_256(text.encode('utf-8')).digest(384)
+
     @staticmethod
     def _text_to_embedding(text: str) -> List[float]:
         """Convert text to a 384-dim embedding using multiple hash functions"""
-        # Use multiple hash seeds to create a 384-dimensional vector
-        embedding = []
-        for seed in range(12):  # 12 seeds * 32 values = 384 dimensions
-            hash_input = f"{seed}:{text}".encode('utf-8')
-            hash_bytes = hashlib.sha256(hash_input).digest()
-            # Convert bytes to 32 float values between -1 and 1
-            for i in range(0, 32):
-                val = (hash_bytes[i % len(hash_bytes)] / 255.0) * 2 - 1
-                embedding.append(val)
-        
+        # Map bytes to floats between -1 and 1
+        embedding = np.frombuffer(EmbeddingService._hash_bytes(text), dtype=np.uint8).astype(np.float32)
+        embedding = embedding * (2.0 / 255.0) - 1.0
+
         # Normalize to unit vector
         norm = np.linalg.norm(embedding)
         if norm > 0:
-            embedding = [x / norm for x in embedding]
-        
-        return embedding
+            embedding /= norm
+
+        return embedding.tolist()
 
     @staticmethod
     def embed_query(text: str) -> List[float]:
         """Single text embedding"""
-        return EmbeddingService._text_to_embedding(text)
+        if EmbeddingService.get_model() is None:
+            return EmbeddingService._text_to_embedding(text)
+        return EmbeddingService._encode([text])[0].tolist()
 
     @staticmethod
     def embed_documents(texts: List[str]) -> List[List[float]]:
         """Batch embedding"""
-        return [EmbeddingService._text_to_embedding(text) for text in texts]
+        if not texts:
+            return []
+
+        if EmbeddingService.get_model() is not None:
+            # Smart batching: sort by length so each batch holds similarly sized texts
+            # and padding to the batch maximum wastes little compute.
+            order = np.argsort([len(text) for text in texts], kind="stable")
+            arr = np.empty((len(texts), 384), dtype=np.float32)
+            for start in range(0, len(texts), EmbeddingService.BATCH_SIZE):
+                batch_idx = order[start:start + EmbeddingService.BATCH_SIZE]
+                # Write results back at their original positions
+                arr[batch_idx] = EmbeddingService._encode([texts[i] for i in batch_idx])
+            return arr.tolist()
+
+        # Hash every text into one (N, 384) matrix, then scale and normalize all rows at once
+        arr = np.empty((len(texts), 384), dtype=np.float32)
+        for i, text in enumerate(texts):
+            arr[i] = np.frombuffer(EmbeddingService._hash_bytes(text), dtype=np.uint8)
+
+        arr = arr * (2.0 / 255.0) - 1.0
+        arr /= np.linalg.norm(arr, axis=1, keepdims=True).clip(min=1e-12)
+        return arr.tolist()
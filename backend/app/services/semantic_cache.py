@@ -0,0 +1,171 @@
+import hashlib
+import time
+import numpy as np
+import redis
+import redis.asyncio as aioredis
+from typing import List, Optional
+from redis.commands.search.field import TagField, VectorField
+from redis.commands.search.query import Query
+try:
+    from redis.commands.search.index_definition import IndexDefinition, IndexType
+except ImportError:  # redis-py < 6
+    from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+
+from app.core.config import settings
+from app.schemas.document import AugmentedQueryResponse
+
+class SemanticCache:
+    """
+    Caches answered queries in Redis, keyed by user, k and query embedding.
+    Lookups are an HNSW nearest-neighbour search restricted to the user's own entries.
+    The cache is an optimisation only: any Redis failure behaves as a miss.
+    """
+    _client = None
+    # After a failure, skip Redis until this time instead of stalling every query
+    _retry_at = 0.0
+
+    INDEX_NAME = "semantic_cache_v2"
+    KEY_PREFIX = "cache:"
+    VECTOR_DIM = 384
+    RETRY_AFTER = 30 # seconds
+    INVALIDATE_BATCH = 1000
+
+    @classmethod
+    async def get_client(cls) -> Optional[aioredis.Redis]:
+        """Shared async client with the index ensured; None while Redis is marked unavailable."""
+        if time.monotonic() < cls._retry_at:
+            return None
+        if cls._client is None:
+            client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=settings.REDIS_TIMEOUT,
+                socket_timeout=settings.REDIS_TIMEOUT,
+            )
+            try:
+                try:
+                    await client.ft(cls.INDEX_NAME).info()
+                except redis.ResponseError:
+                    await cls._create_index(client)
+            except redis.RedisError:
+                cls._mark_unavailable()
+                await client.aclose()
+                return None
+            # Only remember the client once the index is known to exist
+            cls._client = client
+        return cls._client
+
+    @classmethod
+    async def _create_index(cls, client: aioredis.Redis):
+        # 'response' is stored in the hash but deliberately not indexed
+        schema = (
+            TagField("user_id"),
+            TagField("k"),
+            VectorField(
+                "embedding",
+                "HNSW",
+                {"TYPE": "FLOAT32", "DIM": cls.VECTOR_DIM, "DISTANCE_METRIC": "COSINE"},
+            ),
+        )
+        try:
+            await client.ft(cls.INDEX_NAME).create_index(
+                schema,
+                definition=IndexDefinition(prefix=[cls.KEY_PREFIX], index_type=IndexType.HASH),
+            )
+        except redis.ResponseError as e:
+            # Another process created it concurrently; that's what we wanted
+            if "Index already exists" not in str(e):
+                raise
+
+    @classmethod
+    def _mark_unavailable(cls):
+        cls._retry_at = time.monotonic() + cls.RETRY_AFTER
+
+    @staticmethod
+    def _user_entries(user_id: int) -> Query:
+        """One page of the user's cache keys, looked up through the index (no keyspace SCAN)."""
+        return Query(f"@user_id:{{{user_id}}}").no_content().paging(0, SemanticCache.INVALIDATE_BATCH)
+
+    @staticmethod
+    async def check(user_id: int, k: int, vec: List[float], threshold: float = 0.95) -> Optional[AugmentedQueryResponse]:
+        """
+        Return the cached response for the closest previous query of this user
+        with the same 'k', if its cosine similarity is at least 'threshold'.
+        """
+        client = await SemanticCache.get_client()
+        if client is None:
+            return None
+        try:
+            # Tag filter keeps the KNN search inside the user's namespace
+            q = (
+                Query(f"(@user_id:{{{user_id}}} @k:{{{k}}})=>[KNN 1 @embedding $vec AS distance]")
+                .return_fields("response", "distance")
+                .dialect(2)
+            )
+            params = {"vec": np.asarray(vec, dtype=np.float32).tobytes()}
+            docs = (await client.ft(SemanticCache.INDEX_NAME).search(q, query_params=params)).docs
+        except redis.RedisError:
+            SemanticCache._mark_unavailable()
+            return None
+
+        if not docs:
+            return None
+        # COSINE distance in RediSearch is 1 - cosine similarity
+        if 1 - float(docs[0].distance) < threshold:
+            return None
+        return AugmentedQueryResponse.model_validate_json(docs[0].response)
+
+    @staticmethod
+    async def store(user_id: int, k: int, vec: List[float], response: AugmentedQueryResponse, ttl: int = 300):
+        """Cache 'response' for this user's query vector and k, expiring after 'ttl' seconds."""
+        client = await SemanticCache.get_client()
+        if client is None:
+            return
+        embedding = np.asarray(vec, dtype=np.float32).tobytes()
+        digest = hashlib.sha256(f"{k}:".encode() + embedding).hexdigest()
+        key = f"{SemanticCache.KEY_PREFIX}{user_id}:{digest}"
+        try:
+            await client.hset(key, mapping={
+                "user_id": user_id,
+                "k": k,
+                "embedding": embedding,
+                "response": response.model_dump_json(),
+            })
+            await client.expire(key, ttl)
+        except redis.RedisError:
+            SemanticCache._mark_unavailable()
+
+    @staticmethod
+    async def invalidate(user_id: int):
+        """Drop all cached answers of a user, e.g. after their documents changed."""
+        client = await SemanticCache.get_client()
+        if client is None:
+            return
+        try:
+            # Deleted keys leave the index, so keep taking the first page until it is empty
+            while True:
+                result = await client.ft(SemanticCache.INDEX_NAME).search(SemanticCache._user_entries(user_id))
+                if not result.docs:
+                    break
+                await client.unlink(*[doc.id for doc in result.docs])
+        except redis.RedisError:
+            SemanticCache._mark_unavailable()
+
+    @staticmethod
+    def invalidate_sync(user_id: int):
+        """Blocking variant of invalidate() for Celery workers."""
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_TIMEOUT,
+            socket_timeout=settings.REDIS_TIMEOUT,
+        )
+        try:
+            while True:
+                result = client.ft(SemanticCache.INDEX_NAME).search(SemanticCache._user_entries(user_id))
+                if not result.docs:
+                    break
+                client.unlink(*[doc.id for doc in result.docs])
+        except redis.RedisError:
+            # Includes a missing index, i.e. nothing has been cached yet
+            pass
+        finally:
+            client.close()
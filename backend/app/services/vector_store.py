@@ -1,19 +1,24 @@
 import chromadb
-import uuid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from app.core.config import settings
 
 class VectorStore:
     _client = None
     _collection = None
 
+    # One collection per embedding space, so vectors from different spaces never mix.
+    # The original "user_memories" collection holds seeded SHA-256 hash vectors, which
+    # the current SHAKE256 hash embedder cannot match; it is no longer read. Run
+    # app.workers.reindex to rebuild the active collection from SQL.
+    COLLECTIONS = {"minilm": "user_memories_minilm", "hash": "user_memories_shake256"}
+
     @classmethod
     def get_collection(cls):
         if cls._client is None:
             # Persistent storage for production/dev
             cls._client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
             cls._collection = cls._client.get_or_create_collection(
-                name="user_memories",
+                name=cls.COLLECTIONS[settings.EMBEDDING_BACKEND],
                 metadata={"hnsw:space": "cosine"}
             )
         return cls._collection
@@ -22,26 +27,31 @@ class VectorStore:
     def add_vectors(
         user_id: int, 
         doc_id: int, 
-        texts: List[str], 
+        ranges: List[Tuple[int, int]], 
         embeddings: List[List[float]]
     ):
         collection = VectorStore.get_collection()
         
-        count = len(texts)
+        count = len(ranges)
         if count == 0:
             return
 
-        # Generate unique IDs for chunks: user_doc_chunkUUID
-        ids = [f"{user_id}_{doc_id}_{uuid.uuid4()}" for _ in range(count)]
+        # (user, doc, chunk_index) is already unique: user_doc_chunkIndex
+        ids = [f"{user_id}_{doc_id}_{i}" for i in range(count)]
         
-        # KEY: Metadata contains user_id for filtering
+        # KEY: Metadata contains user_id for filtering.
+        # Chunk text is not stored here: the SQL row already holds it, and
+        # the (start, end) offsets let the snippet be sliced out at query time.
         metadatas = [
-            {"user_id": user_id, "doc_id": doc_id, "chunk_index": i} 
-            for i in range(count)
+            {"user_id": user_id, "doc_id": doc_id, "chunk_index": i, "start": start, "end": end} 
+            for i, (start, end) in enumerate(ranges)
         ]
         
-        collection.add(
-            documents=texts,
+        # Embeddings are kept as float32: Chroma's HNSW index (hnswlib) only stores
+        # float32, so int8-quantized values would be upcast on insert and save nothing.
+        # Quantized storage needs a backend with native int8 support (e.g. FAISS, Milvus).
+        # Deterministic IDs + upsert make re-ingesting a document idempotent
+        collection.upsert(
             embeddings=embeddings,
             metadatas=metadatas,
             ids=ids
@@ -59,6 +69,7 @@ class VectorStore:
             query_embeddings=[query_vector],
             n_results=k,
             where={"user_id": user_id}, # <--- PRIVACY ENFORCEMENT
+            # "documents" only holds text for vectors written before offsets were stored
             include=["documents", "metadatas", "distances"]
         )
         return results
@@ -0,0 +1,74 @@
+import uuid
+from celery import Celery
+from celery.signals import worker_process_init
+
+from app.core.config import settings
+from app.core.database import SyncSessionLocal
+from app.models.document import Document
+from app.services.chunking import chunk_ranges
+from app.services.embedding import EmbeddingService
+from app.services.semantic_cache import SemanticCache
+from app.services.vector_store import VectorStore
+
+# Run a worker with: celery -A app.workers.celery_app worker --loglevel=info
+celery_app = Celery(
+    "recall",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND
+)
+
+@worker_process_init.connect
+def _load_embedding_model(**kwargs):
+    # Load once per worker process; fails fast if the model is expected but not exported
+    EmbeddingService.get_model()
+
+def _document_exists(doc_id: int, user_id: int) -> bool:
+    with SyncSessionLocal() as db:
+        return db.query(Document.id).filter(
+            Document.id == doc_id, Document.user_id == user_id
+        ).first() is not None
+
+@celery_app.task
+def embed_and_index(doc_id: int, user_id: int, content: str) -> int:
+    """
+    Chunk, embed and store a document's vectors. Returns the number of chunks indexed.
+    """
+    # The document may have been deleted while the task was queued
+    if not _document_exists(doc_id, user_id):
+        return 0
+
+    # 1. Chunk Text
+    ranges = chunk_ranges(content)
+
+    # 2. Generate Embeddings (CPU intensive, kept out of the API process)
+    # The model needs strings, so chunks are only materialized here
+    embeddings = EmbeddingService.embed_documents([content[s:e] for s, e in ranges])
+
+    # 3. Store in Vector DB with Isolation
+    VectorStore.add_vectors(
+        user_id=user_id,
+        doc_id=doc_id,
+        ranges=ranges,
+        embeddings=embeddings
+    )
+
+    # A delete that ran while we were embedding would leave orphan vectors behind.
+    # Deletes commit SQL before removing vectors, so re-checking here closes the gap.
+    if not _document_exists(doc_id, user_id):
+        VectorStore.delete_document(user_id=user_id, doc_id=doc_id)
+        return 0
+
+    # 4. Cached answers predate this document; drop them so it becomes visible
+    SemanticCache.invalidate_sync(user_id)
+    return len(ranges)
+
+def new_task_id(user_id: int) -> str:
+    """Task ids carry their owner, so status lookups can be restricted to them."""
+    return f"{user_id}-{uuid.uuid4()}"
+
+def enqueue_ingest(doc_id: int, user_id: int, content: str):
+    """Queue embed_and_index for a stored document. Blocking: publishes to the broker."""
+    return embed_and_index.apply_async(
+        args=(doc_id, user_id, content),
+        task_id=new_task_id(user_id)
+    )
@@ -0,0 +1,33 @@
+"""
+Re-queue indexing for documents that have no vectors in the active collection,
+e.g. after switching EMBEDDING_BACKEND or upgrading to a new embedding space.
+
+Run with: python -m app.workers.reindex   (a Celery worker must be running)
+"""
+from app.core.database import SyncSessionLocal
+from app.models.document import Document
+from app.services.vector_store import VectorStore
+from app.workers.celery_app import enqueue_ingest
+
+def reindex_missing() -> int:
+    """Queue embed_and_index for every unindexed document; returns how many were queued."""
+    collection = VectorStore.get_collection()
+    queued = 0
+    with SyncSessionLocal() as db:
+        rows = db.query(Document.id, Document.user_id, Document.content).yield_per(500)
+        for doc_id, user_id, content in rows:
+            if not content:
+                continue
+            existing = collection.get(
+                where={"$and": [{"user_id": user_id}, {"doc_id": doc_id}]},
+                limit=1,
+                include=[]
+            )
+            if existing["ids"]:
+                continue
+            enqueue_ingest(doc_id, user_id, content)
+            queued += 1
+    return queued
+
+if __name__ == "__main__":
+    print(f"Queued {reindex_missing()} document(s) for indexing")
@@ -0,0 +1,47 @@
+import pytest
+
+from app.services.chunking import simple_chunker, token_chunker
+
+class WhitespaceTokenizer:
+    """Minimal stand-in for a HF fast tokenizer: one token per whitespace-separated word."""
+
+    def __call__(self, text, **kwargs):
+        offsets = []
+        pos = 0
+        for word in text.split():
+            start = text.index(word, pos)
+            offsets.append((start, start + len(word)))
+            pos = start + len(word)
+        return {"offset_mapping": offsets}
+
+def test_simple_chunker_ranges_overlap_and_cover_text():
+    text = "x" * 1000
+    assert simple_chunker(text, chunk_size=500, overlap=50) == [(0, 500), (450, 950), (900, 1000)]
+
+def test_simple_chunker_empty_text():
+    assert simple_chunker("") == []
+
+def test_simple_chunker_clamps_overlap():
+    # overlap >= chunk_size would otherwise never advance
+    assert simple_chunker("abcde", chunk_size=2, overlap=5) == [(0, 2), (1, 3), (2, 4), (3, 5), (4, 5)]
+
+def test_token_chunker_windows_on_token_boundaries():
+    text = "Alpha  beta gamma delta epsilon"
+    ranges = token_chunker(text, WhitespaceTokenizer(), chunk_tokens=2, overlap_tokens=1)
+    # Slices keep the original text, including casing and inner spacing
+    assert [text[s:e] for s, e in ranges] == [
+        "Alpha  beta", "beta gamma", "gamma delta", "delta epsilon"
+    ]
+
+def test_token_chunker_single_window():
+    text = "one two three"
+    assert token_chunker(text, WhitespaceTokenizer(), chunk_tokens=10, overlap_tokens=2) == [(0, len(text))]
+
+def test_token_chunker_clamps_overlap():
+    text = "a b c"
+    ranges = token_chunker(text, WhitespaceTokenizer(), chunk_tokens=2, overlap_tokens=32)
+    assert [text[s:e] for s, e in ranges] == ["a b", "b c"]
+
+def test_token_chunker_rejects_empty_window():
+    with pytest.raises(ValueError):
+        token_chunker("a b", WhitespaceTokenizer(), chunk_tokens=0)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from app.services.embedding import EmbeddingService
+
+def test_hash_embed_documents_matches_embed_query(monkeypatch):
+    monkeypatch.setattr(EmbeddingService, "get_model", classmethod(lambda cls: None))
+    texts = ["first", "a much longer second text", ""]
+    embeddings = EmbeddingService.embed_documents(texts)
+    assert len(embeddings) == 3
+    for text, vec in zip(texts, embeddings):
+        assert np.allclose(vec, EmbeddingService.embed_query(text), atol=1e-6)
+        assert np.isclose(np.linalg.norm(vec), 1.0, atol=1e-5)
+
+def test_smart_batching_restores_input_order(monkeypatch):
+    # Fake model: each vector's first component encodes the text's length
+    def fake_encode(batch):
+        out = np.zeros((len(batch), 384), dtype=np.float32)
+        out[:, 0] = [len(t) for t in batch]
+        return out
+
+    monkeypatch.setattr(EmbeddingService, "get_model", classmethod(lambda cls: (object(), object())))
+    monkeypatch.setattr(EmbeddingService, "_encode", staticmethod(fake_encode))
+    monkeypatch.setattr(EmbeddingService, "BATCH_SIZE", 2)
+
+    texts = ["x" * n for n in [5, 1, 4, 2, 3]]
+    embeddings = EmbeddingService.embed_documents(texts)
+    assert [vec[0] for vec in embeddings] == [5, 1, 4, 2, 3]
+
+def test_embed_documents_empty():
+    assert EmbeddingService.embed_documents([]) == []
@@ -25,6 +25,7 @@ export const IngestionPage: React.FC<IngestionPageProps> = ({ onNavigate }) => {
   const [error, setError] = useState('');
   const [success, setSuccess] = useState(false);
   const [uploadedMemory, setUploadedMemory] = useState<any>(null);
+  const [indexing, setIndexing] = useState(false);
 
   const addTag = () => {
     const trimmedTag = tagInput.trim().toLowerCase();
@@ -38,6 +39,19 @@ export const IngestionPage: React.FC<IngestionPageProps> = ({ onNavigate }) => {
     setTags(tags.filter(tag => tag !== tagToRemove));
   };
 
+  // The backend indexes uploads in the background; poll until the memory is searchable
+  const waitForIndexing = async (taskId: string) => {
+    for (let attempt = 0; attempt < 120; attempt++) {
+      const status = await fetchAPI(`/ingest/status/${taskId}`);
+      if (status.status === 'SUCCESS') return;
+      if (status.status === 'FAILURE') {
+        throw new Error('Memory saved, but indexing failed. It will not appear in search results.');
+      }
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+    throw new Error('Memory saved, but indexing is taking longer than expected.');
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setError('');
@@ -64,6 +78,12 @@ export const IngestionPage: React.FC<IngestionPageProps> = ({ onNavigate }) => {
       // Response check is handled inside fetchAPI, if it returns it's successful
       // But fetchAPI returns response.json(), so 'data' is the JSON body.
 
+      setIndexing(true);
+      try {
+        await waitForIndexing(data.task_id);
+      } finally {
+        setIndexing(false);
+      }
 
       setUploadedMemory(data);
       setSuccess(true);
@@ -120,7 +140,7 @@ export const IngestionPage: React.FC<IngestionPageProps> = ({ onNavigate }) => {
         <Alert className="border-green-500/20 bg-green-500/5">
           <Check className="h-4 w-4 text-green-600" />
           <AlertDescription className="text-green-700">
-            <strong>Memory uploaded successfully!</strong>
+            <strong>Memory uploaded and indexed successfully!</strong>
           </AlertDescription>
         </Alert>
       )}
@@ -222,7 +242,7 @@ export const IngestionPage: React.FC<IngestionPageProps> = ({ onNavigate }) => {
             {/* Submit Button */}
             <div className="flex gap-3 pt-4">
               <Button type="submit" disabled={loading || !content.trim()} className="flex-1">
-                {loading ? 'Uploading...' : 'Upload Memory'}
+                {indexing ? 'Indexing...' : loading ? 'Uploading...' : 'Upload Memory'}
               </Button>
               <Button
                 type="button"
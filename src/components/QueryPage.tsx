@@ -7,7 +7,7 @@ import { Badge } from './ui/badge';
 import { Alert, AlertDescription } from './ui/alert';
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from './ui/collapsible';
 import { Send, ChevronDown, ChevronUp, Database, Shield, Loader2 } from 'lucide-react';
-import { fetchAPI } from '../utils/api';
+import { streamAPI } from '../utils/api';
 
 interface Source {
   memoryId: string;
@@ -48,38 +48,43 @@ export const QueryPage: React.FC = () => {
     const currentQuery = query.trim();
     setQuery('');
 
+    const resultId = crypto.randomUUID();
+    // Show the question right away; the answer fills in as tokens stream back
+    setResults(prev => [...prev, {
+      id: resultId,
+      query: currentQuery,
+      answer: '',
+      sources: [],
+      sourcesCount: 0,
+      timestamp: new Date().toISOString()
+    }]);
+    const updateResult = (update: (result: QueryResult) => QueryResult) => {
+      setResults(prev => prev.map(r => (r.id === resultId ? update(r) : r)));
+    };
+
     try {
-      // Switched to local backend via fetchAPI
-      const data = await fetchAPI('/query/', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ query: currentQuery })
+      // Backend streams 'token' events with answer text, then one 'sources' event (SearchResult[])
+      await streamAPI('/query/stream', { query: currentQuery }, (event, data) => {
+        if (event === 'token') {
+          updateResult(r => ({ ...r, answer: r.answer + data.content }));
+        } else if (event === 'error') {
+          updateResult(r => ({ ...r, answer: data.detail }));
+        } else if (event === 'sources') {
+          const sources: Source[] = (data || []).map((item: any) => ({
+            memoryId: item.document_id.toString(),
+            title: item.metadata.title || `Memory #${item.document_id}`,
+            snippet: item.content_snippet,
+            tags: [], // Tags available in metadata? item.metadata.tags? For now empty
+            createdAt: new Date().toISOString() // Metadata might have created_at if we included it
+          }));
+          updateResult(r => ({ ...r, sources, sourcesCount: sources.length }));
+        }
       });
 
-      // Backend now returns AugmentedQueryResponse: { answer: string, sources: SearchResult[] }
-
-      const sources: Source[] = (data.sources || []).map((item: any) => ({
-        memoryId: item.document_id.toString(),
-        title: item.metadata.title || `Memory #${item.document_id}`,
-        snippet: item.content_snippet,
-        tags: [], // Tags available in metadata? item.metadata.tags? For now empty
-        createdAt: new Date().toISOString() // Metadata might have created_at if we included it
-      }));
-
-      const newResult: QueryResult = {
-        id: crypto.randomUUID(),
-        query: currentQuery,
-        answer: data.answer || "No answer generated.",
-        sources: sources,
-        sourcesCount: sources.length,
-        timestamp: new Date().toISOString()
-      };
-
-      setResults([...results, newResult]);
+      updateResult(r => (r.answer ? r : { ...r, answer: "No answer generated." }));
 
     } catch (err: any) {
+      setResults(prev => prev.filter(r => r.id !== resultId));
       setError(err.message || 'Failed to process query');
       console.error('Error processing query:', err);
     } finally {
@@ -144,7 +149,8 @@ export const QueryPage: React.FC = () => {
               </div>
             </div>
 
-            {/* AI Response */}
+            {/* AI Response (appears with the first streamed token) */}
+            {result.answer && (
             <div className="flex justify-start">
               <Card className="max-w-[85%] bg-muted/50">
                 <CardContent className="pt-6 space-y-4">
@@ -203,10 +209,11 @@ export const QueryPage: React.FC = () => {
                 </CardContent>
               </Card>
             </div>
+            )}
           </div>
         ))}
 
-        {loading && (
+        {loading && !results[results.length - 1]?.answer && (
           <div className="flex justify-start">
             <Card className="max-w-[85%] bg-muted/50">
               <CardContent className="pt-6">
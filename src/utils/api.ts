@@ -42,3 +42,59 @@ export const fetchAPI = async (endpoint: string, options: RequestInit = {}) => {
 
     return response.json();
 };
+
+// POST to a Server-Sent Events endpoint and call onEvent for each event as it arrives.
+// Event data is JSON-encoded by the backend.
+export const streamAPI = async (
+    endpoint: string,
+    body: unknown,
+    onEvent: (event: string, data: any) => void,
+) => {
+    const token = localStorage.getItem('accessToken');
+
+    const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+        method: 'POST',
+        headers: getAuthHeaders(token),
+        body: JSON.stringify(body),
+    });
+
+    if (!response.ok || !response.body) {
+        let errorMessage = 'An error occurred';
+        try {
+            const errorData = await response.json();
+            if (errorData.detail) {
+                errorMessage = typeof errorData.detail === 'string'
+                    ? errorData.detail
+                    : JSON.stringify(errorData.detail);
+            }
+        } catch (e) {
+            errorMessage = response.statusText;
+        }
+        throw new Error(errorMessage);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+};